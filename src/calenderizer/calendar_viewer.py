@@ -8,285 +8,87 @@ weekly, and daily views.
 """
 
 import os
+import re
 import argparse
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import calendar
-from collections import defaultdict
-from icalendar import Calendar
-import pytz
+from functools import lru_cache
+from html import escape
+from operator import itemgetter
+from string import Template
+from zoneinfo import ZoneInfo
 
-def get_week_dates(date, work_week=True):
-    """Get the dates for the week containing the given date."""
-    monday = date - timedelta(days=date.weekday())
-    return [monday + timedelta(days=i) for i in range(5 if work_week else 7)]
-
-def format_event_time(event):
-    """Format the event time consistently."""
-    start_time = event['start'].strftime("%I:%M")
-    end_time = event['end'].strftime("%I:%M")
-    am_pm = event['end'].strftime("%p").lower()
-    return f"{start_time}-{end_time}{am_pm}"
-
-def format_event_title(event):
-    """Format the event title consistently."""
-    summary = event['summary']
-    phase = summary.split(':')[0] if ':' in summary else ''
-    title = summary.split(':', 1)[1] if ':' in summary else summary
-    return phase, title.strip()
-
-def create_daily_view(events_by_date, date):
-    """Create HTML for a daily view."""
-    html = f"""
-        <div class="day-view">
-            <div class="day-header">
-                <h2>{date.strftime("%A, %B %d, %Y")}</h2>
-            </div>
-            <div class="timeline">
-                <div class="time-axis">
-                    {''.join(f'<div class="hour-marker">{h:02d}:00</div>' for h in range(9, 18))}
-                </div>
-                <div class="events-container">
-    """
-
-    if date in events_by_date:
-        for event in sorted(events_by_date[date], key=lambda x: x['start']):
-            start_time = event['start']
-            end_time = event['end']
-            duration = (end_time - start_time).total_seconds() / 3600  # hours
-            start_hour = start_time.hour + start_time.minute / 60
-            top_position = (start_hour - 9) * 60  # Start at 9 AM, convert to pixels (1 hour = 60px)
-            height = duration * 60  # Convert hours to pixels (1 hour = 60px)
-            phase, title = format_event_title(event)
-
-            html += f"""
-                <div class="day-event" style="top: {top_position}px; height: {height}px;">
-                    <div class="event-phase">{phase}</div>
-                    <div class="event-details">
-                        <div class="event-time">{format_event_time(event)}</div>
-                        <div class="event-title">{title}</div>
-                        <div class="event-description">{event['description']}</div>
-                    </div>
-                </div>
-            """
-    else:
-        html += '<div class="no-events">No events scheduled</div>'
-
-    html += """
-                </div>
-            </div>
-        </div>
-    """
-    return html
-
-def create_weekly_view(events_by_date, start_date):
-    """Create HTML for a weekly view."""
-    week_dates = get_week_dates(start_date)
-    html = f"""
-        <div class="week">
-            <div class="week-header">
-                Week of {week_dates[0].strftime("%B %d, %Y")}
-            </div>
-            <div class="weekdays">
-    """
-
-    for date in week_dates:
-        day_name = calendar.day_name[date.weekday()]
-        today_class = " today" if date == datetime.now().date() else ""
-
-        html += f"""
-            <div class="weekday{today_class}">
-                <div class="weekday-header">
-                    <div class="day-name">{day_name}</div>
-                    <div class="date">{date.strftime("%B %d")}</div>
-                </div>
-        """
-
-        if date in events_by_date:
-            for event in sorted(events_by_date[date], key=lambda x: x['start']):
-                phase, title = format_event_title(event)
-                html += f"""
-                    <div class="event" title="{event['description']}">
-                        <span class="event-time">{format_event_time(event)}</span>
-                        <span class="event-title">{phase} {title}</span>
-                    </div>
-                """
+# Backslash escapes allowed in iCalendar TEXT values (RFC 5545, 3.3.11)
+_TEXT_ESCAPE_RE = re.compile(r'\\([\\;,nN])')
 
-        html += "</div>"
-
-    html += """
-            </div>
-        </div>
-    """
-    return html
-
-def create_monthly_view(events_by_date, year, month):
-    """Create HTML for a monthly view."""
-    cal_obj = calendar.monthcalendar(year, month)
-
-    html = f"""
-        <div class="month">
-            <div class="month-header">
-                {calendar.month_name[month]} {year}
-            </div>
-            <div class="weekdays">
-                <div>Sun</div>
-                <div>Mon</div>
-                <div>Tue</div>
-                <div>Wed</div>
-                <div>Thu</div>
-                <div>Fri</div>
-                <div>Sat</div>
-            </div>
-            <div class="days">
-    """
-
-    for week in cal_obj:
-        for day in week:
-            if day == 0:
-                html += '<div class="day other-month"></div>'
-            else:
-                date = datetime(year, month, day).date()
-                today_class = " today" if date == datetime.now().date() else ""
-                html += f'<div class="day{today_class}">'
-                html += f'<div class="day-number">{day}</div>'
-
-                if date in events_by_date:
-                    for event in sorted(events_by_date[date], key=lambda x: x['start'])[:3]:  # Show max 3 events
-                        phase, title = format_event_title(event)
-                        html += f"""
-                            <div class="event" title="{event['description']}">
-                                <span class="event-time">{format_event_time(event)}</span>
-                                <span class="event-title">{title}</span>
-                            </div>
-                        """
-                    if len(events_by_date[date]) > 3:
-                        html += f'<div class="more-events">+{len(events_by_date[date]) - 3} more</div>'
-
-                html += '</div>'
-
-    html += """
-            </div>
-        </div>
-    """
-    return html
-
-def create_html_calendar(ics_file='project_schedule.ics', view='weekly', date=None):
-    """Create an HTML view of the calendar."""
-    if not os.path.exists(ics_file):
-        print(f"Error: {ics_file} not found. Please run the calendar generator first.")
-        return
-
-    # Read the calendar file
-    with open(ics_file, 'rb') as f:
-        cal = Calendar.from_ical(f.read())
-
-    # Group events by date
-    events_by_date = defaultdict(list)
-    all_dates = set()
-    for component in cal.walk():
-        if component.name == "VEVENT":
-            start = component.get('dtstart').dt
-            date_key = start.date()
-            all_dates.add(date_key)
-            events_by_date[date_key].append({
-                'start': start,
-                'end': component.get('dtend').dt,
-                'summary': component.get('summary', ''),
-                'description': component.get('description', '')
-            })
-
-    # Set default date to first event date if not specified
-    if date is None:
-        date = min(all_dates)
-    elif isinstance(date, str):
-        date = datetime.strptime(date, "%Y-%m-%d").date()
-
-    # Format current date for display
-    current_date_str = date.strftime("%Y-%m-%d %H:%M:%S")
-
-    # Generate appropriate calendar content based on view
-    if view == 'daily':
-        calendar_content = create_daily_view(events_by_date, date)
-    elif view == 'weekly':
-        calendar_content = create_weekly_view(events_by_date, date)
-    else:  # monthly
-        calendar_content = create_monthly_view(events_by_date, date.year, date.month)
-
-    # Create HTML content
-    html = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Project Calendar</title>
-        <meta charset="UTF-8">
-        <style>
-            body {{
+# Static page styles and the page shell; only the placeholders change per render
+_CSS = """            body {
                 font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
                 margin: 0;
                 padding: 20px;
                 background: #fff;
                 color: #333;
-            }}
-            .calendar-container {{
+            }
+            .calendar-container {
                 max-width: 1200px;
                 margin: 0 auto;
-            }}
+            }
             /* Weekly view styles */
-            .week {{
+            .week {
                 margin-bottom: 30px;
-            }}
-            .week-header {{
+            }
+            .week-header {
                 text-align: left;
                 font-size: 16px;
                 margin-bottom: 10px;
                 color: #333;
                 font-weight: 500;
                 padding: 0 8px;
-            }}
-            .weekdays {{
+            }
+            .weekdays {
                 display: grid;
                 grid-template-columns: repeat(5, 1fr);
                 border: 1px solid #ddd;
-            }}
-            .weekday {{
+            }
+            .weekday {
                 padding: 12px;
                 border-right: 1px solid #ddd;
                 min-height: 120px;
-            }}
-            .weekday:last-child {{
+            }
+            .weekday:last-child {
                 border-right: none;
-            }}
-            .weekday-header {{
+            }
+            .weekday-header {
                 padding-bottom: 8px;
                 margin-bottom: 8px;
                 border-bottom: 1px solid #ddd;
-            }}
+            }
             /* Daily view styles */
-            .day-view {{
+            .day-view {
                 border: 1px solid #ddd;
                 border-radius: 4px;
                 padding: 20px;
-            }}
-            .day-header {{
+            }
+            .day-header {
                 margin-bottom: 20px;
-            }}
-            .day-header h2 {{
+            }
+            .day-header h2 {
                 margin: 0;
                 font-weight: normal;
                 color: #333;
-            }}
-            .timeline {{
+            }
+            .timeline {
                 display: flex;
                 gap: 20px;
                 position: relative;
                 margin-top: 20px;
-            }}
-            .time-axis {{
+            }
+            .time-axis {
                 width: 60px;
                 position: relative;
                 height: 540px;  /* 9 hours * 60px */
-            }}
-            .hour-marker {{
+            }
+            .hour-marker {
                 position: absolute;
                 left: 0;
                 width: 100%;
@@ -294,15 +96,15 @@ def create_html_calendar(ics_file='project_schedule.ics', view='weekly', date=No
                 color: #70757a;
                 height: 60px;  /* 1 hour = 60px */
                 border-top: 1px solid #eee;
-            }}
-            .events-container {{
+            }
+            .events-container {
                 flex: 1;
                 position: relative;
                 height: 540px;  /* 9 hours * 60px */
                 background: linear-gradient(#eee 1px, transparent 1px);
                 background-size: 100% 60px;  /* 1 hour = 60px */
-            }}
-            .day-event {{
+            }
+            .day-event {
                 position: absolute;
                 left: 0;
                 right: 0;
@@ -314,36 +116,36 @@ def create_html_calendar(ics_file='project_schedule.ics', view='weekly', date=No
                 border-left: 4px solid #185abc;
                 overflow: hidden;
                 transition: all 0.2s ease;
-            }}
-            .day-event:hover {{
+            }
+            .day-event:hover {
                 background: #d2e3fc;
                 z-index: 100;
                 box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-            }}
-            .event-phase {{
+            }
+            .event-phase {
                 font-weight: 500;
                 color: #185abc;
                 min-width: 100px;
-            }}
-            .event-details {{
+            }
+            .event-details {
                 flex: 1;
                 min-width: 0;  /* Allow text truncation */
-            }}
-            .event-description {{
+            }
+            .event-description {
                 margin-top: 8px;
                 color: #555;
                 font-size: 12px;
-            }}
+            }
             /* Shared styles */
-            .date {{
+            .date {
                 font-size: 14px;
                 color: #70757a;
-            }}
-            .day-name {{
+            }
+            .day-name {
                 font-weight: 500;
                 color: #333;
-            }}
-            .event {{
+            }
+            .event {
                 margin: 0 0 8px 0;
                 padding: 6px 8px;
                 font-size: 12px;
@@ -351,62 +153,374 @@ def create_html_calendar(ics_file='project_schedule.ics', view='weekly', date=No
                 background: #e8f0fe;
                 color: #185abc;
                 border-radius: 3px;
-            }}
-            .event:hover {{
+            }
+            .event:hover {
                 background: #d2e3fc;
-            }}
-            .event-time {{
+            }
+            .event-time {
                 color: #185abc;
                 font-weight: 500;
                 margin-bottom: 2px;
-            }}
-            .event-title {{
+            }
+            .event-title {
                 color: #333;
                 white-space: nowrap;
                 overflow: hidden;
                 text-overflow: ellipsis;
-            }}
-            .header {{
+            }
+            .header {
                 text-align: center;
                 margin-bottom: 20px;
-            }}
-            .header h1 {{
+            }
+            .header h1 {
                 color: #333;
                 margin: 0 0 5px 0;
                 font-size: 20px;
                 font-weight: normal;
-            }}
-            .header p {{
+            }
+            .header p {
                 color: #70757a;
                 margin: 0;
                 font-size: 13px;
-            }}
-            .today {{
+            }
+            .today {
                 background: #e8f0fe;
-            }}
-            .today .date {{
+            }
+            .today .date {
                 color: #185abc;
                 font-weight: 500;
-            }}
-            .no-events {{
+            }
+            .no-events {
                 color: #70757a;
                 font-style: italic;
                 padding: 20px;
                 text-align: center;
-            }}
+            }"""
+
+_PAGE_TEMPLATE = Template("""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <title>Project Calendar</title>
+        <meta charset="UTF-8">
+        <style>
+$css
         </style>
     </head>
     <body>
         <div class="calendar-container">
             <div class="header">
                 <h1>Project Schedule</h1>
-                <p>{current_date_str}</p>
+                <p>$current_date_str</p>
             </div>
-            {calendar_content}
+            $calendar_content
         </div>
     </body>
     </html>
+    """)
+
+def get_week_dates(date, work_week=True):
+    """Get the dates for the week containing the given date."""
+    monday = date - timedelta(days=date.weekday())
+    return [monday + timedelta(days=i) for i in range(5 if work_week else 7)]
+
+def _unescape_text(value):
+    """Undo the iCalendar TEXT escaping of backslashes, semicolons, commas and newlines."""
+    if '\\' not in value:
+        return value
+    return _TEXT_ESCAPE_RE.sub(lambda m: '\n' if m.group(1) in 'nN' else m.group(1), value)
+
+def _parse_ics_datetime(params, value):
+    """
+    Parse a DATE-TIME value such as 20250609T110000 or 20250609T150000Z.
+
+    UTC values come back in UTC, values with a TZID parameter are placed in
+    that zone, and anything else is returned as a floating (naive) time.
+    """
+    if value.endswith('Z'):
+        tzinfo = timezone.utc
+    elif 'TZID' in params:
+        tzinfo = ZoneInfo(params['TZID'])
+    else:
+        tzinfo = None
+    return datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]),
+                    int(value[9:11]), int(value[11:13]), int(value[13:15]), tzinfo=tzinfo)
+
+def _iter_vevent_properties(ics_file):
+    """
+    Yield a {name: (params, value)} dict for each VEVENT in an ICS file.
+
+    This is a deliberately small reader for the files ics_generator writes:
+    it unfolds continuation lines, then walks the content lines once, keeping
+    only the properties that sit directly inside a VEVENT.
+    """
+    with open(ics_file, 'rb') as f:
+        data = f.read()
+    data = data.replace(b'\r\n', b'\n').replace(b'\n ', b'').replace(b'\n\t', b'')
+
+    properties = None
+    depth = 0
+    for line in data.decode('utf-8').split('\n'):
+        if line.startswith('BEGIN:'):
+            if properties is not None:
+                depth += 1
+            elif line == 'BEGIN:VEVENT':
+                properties = {}
+        elif line.startswith('END:'):
+            if depth:
+                depth -= 1
+            elif properties is not None:
+                yield properties
+                properties = None
+        elif properties is not None and not depth:
+            head, _, value = line.partition(':')
+            name, *raw_params = head.split(';')
+            params = {}
+            for param in raw_params:
+                key, _, param_value = param.partition('=')
+                params[key.upper()] = param_value.strip('"')
+            properties[name.upper()] = (params, value)
+
+def load_events(ics_file):
+    """
+    Read the events from an ICS file.
+
+    Yields dicts with 'start', 'end', 'summary' and 'description' keys.
     """
+    for properties in _iter_vevent_properties(ics_file):
+        yield {
+            'start': _parse_ics_datetime(*properties['DTSTART']),
+            'end': _parse_ics_datetime(*properties['DTEND']),
+            'summary': _unescape_text(properties.get('SUMMARY', ({}, ''))[1]),
+            'description': _unescape_text(properties.get('DESCRIPTION', ({}, ''))[1])
+        }
+
+@lru_cache(maxsize=4096)
+def _format_date(date, fmt):
+    """strftime for view headers, memoized since the same dates recur across renders."""
+    return date.strftime(fmt)
+
+def format_event_time(event):
+    """Format the event time consistently."""
+    start_time = event['start'].strftime("%I:%M")
+    end_time = event['end'].strftime("%I:%M")
+    am_pm = event['end'].strftime("%p").lower()
+    return f"{start_time}-{end_time}{am_pm}"
+
+def format_event_title(event):
+    """Format the event title consistently."""
+    summary = event['summary']
+    phase = summary.split(':')[0] if ':' in summary else ''
+    title = summary.split(':', 1)[1] if ':' in summary else summary
+    return phase, title.strip()
+
+def create_daily_view(events_by_date, date):
+    """Create HTML for a daily view."""
+    parts = [f"""
+        <div class="day-view">
+            <div class="day-header">
+                <h2>{_format_date(date, "%A, %B %d, %Y")}</h2>
+            </div>
+            <div class="timeline">
+                <div class="time-axis">
+                    {''.join(f'<div class="hour-marker">{h:02d}:00</div>' for h in range(9, 18))}
+                </div>
+                <div class="events-container">
+    """]
+
+    if date in events_by_date:
+        for event in events_by_date[date]:
+            start_time = event['start']
+            end_time = event['end']
+            duration = (end_time - start_time).total_seconds() / 3600  # hours
+            start_hour = start_time.hour + start_time.minute / 60
+            top_position = (start_hour - 9) * 60  # Start at 9 AM, convert to pixels (1 hour = 60px)
+            height = duration * 60  # Convert hours to pixels (1 hour = 60px)
+
+            parts.append(f"""
+                <div class="day-event" style="top: {top_position}px; height: {height}px;">
+                    <div class="event-phase">{event['phase']}</div>
+                    <div class="event-details">
+                        <div class="event-time">{event['time_str']}</div>
+                        <div class="event-title">{event['title']}</div>
+                        <div class="event-description">{event['description_html']}</div>
+                    </div>
+                </div>
+            """)
+    else:
+        parts.append('<div class="no-events">No events scheduled</div>')
+
+    parts.append("""
+                </div>
+            </div>
+        </div>
+    """)
+    return ''.join(parts)
+
+def create_weekly_view(events_by_date, start_date, today=None):
+    """Create HTML for a weekly view."""
+    if today is None:
+        today = datetime.now().date()
+    week_dates = get_week_dates(start_date)
+    parts = [f"""
+        <div class="week">
+            <div class="week-header">
+                Week of {_format_date(week_dates[0], "%B %d, %Y")}
+            </div>
+            <div class="weekdays">
+    """]
+
+    for date in week_dates:
+        day_name = calendar.day_name[date.weekday()]
+        today_class = " today" if date == today else ""
+
+        parts.append(f"""
+            <div class="weekday{today_class}">
+                <div class="weekday-header">
+                    <div class="day-name">{day_name}</div>
+                    <div class="date">{_format_date(date, "%B %d")}</div>
+                </div>
+        """)
+
+        if date in events_by_date:
+            for event in events_by_date[date]:
+                parts.append(f"""
+                    <div class="event" title="{event['description_html']}">
+                        <span class="event-time">{event['time_str']}</span>
+                        <span class="event-title">{event['phase']} {event['title']}</span>
+                    </div>
+                """)
+
+        parts.append("</div>")
+
+    parts.append("""
+            </div>
+        </div>
+    """)
+    return ''.join(parts)
+
+@lru_cache(maxsize=32)
+def _month_skeleton(year, month, firstweekday=0):
+    """
+    Build the fixed HTML for a month grid.
+
+    Returns the grid with a {dN} placeholder for every day of the month, plus
+    the plain (event-free) cell for each placeholder. Both depend only on the
+    year, month and first day of the week, so they are cached across renders.
+    """
+    # Pad the month out to whole weeks, as calendar.monthcalendar() would
+    first_weekday, days_in_month = calendar.monthrange(year, month)
+    leading = (first_weekday - firstweekday) % 7
+    trailing = -(leading + days_in_month) % 7
+    days = range(1, days_in_month + 1)
+
+    empty_cell = '<div class="day other-month"></div>'
+    cells = [empty_cell] * leading + [f'{{d{day}}}' for day in days] + [empty_cell] * trailing
+    plain_days = {f'd{day}': f'<div class="day"><div class="day-number">{day}</div></div>' for day in days}
+
+    skeleton = f"""
+        <div class="month">
+            <div class="month-header">
+                {calendar.month_name[month]} {year}
+            </div>
+            <div class="weekdays">
+                <div>Sun</div>
+                <div>Mon</div>
+                <div>Tue</div>
+                <div>Wed</div>
+                <div>Thu</div>
+                <div>Fri</div>
+                <div>Sat</div>
+            </div>
+            <div class="days">
+    """ + ''.join(cells) + """
+            </div>
+        </div>
+    """
+    return skeleton, plain_days
+
+def create_monthly_view(events_by_date, year, month, today=None):
+    """Create HTML for a monthly view."""
+    if today is None:
+        today = datetime.now().date()
+    skeleton, plain_days = _month_skeleton(year, month, calendar.firstweekday())
+
+    # Only days with events (or today) differ from the cached plain cells
+    slots = dict(plain_days)
+    dates = {date for date in events_by_date if date.year == year and date.month == month}
+    if today.year == year and today.month == month:
+        dates.add(today)
+    for date in dates:
+        day = date.day
+        today_class = " today" if date == today else ""
+        parts = [f'<div class="day{today_class}">', f'<div class="day-number">{day}</div>']
+        events = events_by_date.get(date, [])
+        for event in events[:3]:  # Show max 3 events
+            parts.append(f"""
+                            <div class="event" title="{event['description_html']}">
+                                <span class="event-time">{event['time_str']}</span>
+                                <span class="event-title">{event['title']}</span>
+                            </div>
+                        """)
+        if len(events) > 3:
+            parts.append(f'<div class="more-events">+{len(events) - 3} more</div>')
+        parts.append('</div>')
+        slots[f'd{day}'] = ''.join(parts)
+
+    return skeleton.format_map(slots)
+
+def create_html_calendar(ics_file='project_schedule.ics', view='weekly', date=None):
+    """Create an HTML view of the calendar."""
+    if not os.path.exists(ics_file):
+        print(f"Error: {ics_file} not found. Please run the calendar generator first.")
+        return
+
+    # Group events by date
+    events_by_date = {}
+    for event in load_events(ics_file):
+        date_key = event['start'].date()
+        # Format (and HTML-escape) display strings once here rather than in every view
+        phase, title = format_event_title(event)
+        event['time_str'] = format_event_time(event)
+        event['phase'] = escape(phase)
+        event['title'] = escape(title)
+        event['description_html'] = escape(event['description'])
+        day_events = events_by_date.get(date_key)
+        if day_events is None:
+            events_by_date[date_key] = [event]
+        else:
+            day_events.append(event)
+
+    # Sort each day's events once so the views can render them in order
+    for events in events_by_date.values():
+        events.sort(key=itemgetter('start'))
+
+    # Set default date to first event date if not specified
+    if date is None:
+        date = min(events_by_date)
+    elif isinstance(date, str):
+        date = datetime.strptime(date, "%Y-%m-%d").date()
+
+    # Looked up once and shared by the views that highlight today
+    today = datetime.now().date()
+
+    # Format current date for display
+    current_date_str = date.strftime("%Y-%m-%d %H:%M:%S")
+
+    # Generate appropriate calendar content based on view
+    if view == 'daily':
+        calendar_content = create_daily_view(events_by_date, date)
+    elif view == 'weekly':
+        calendar_content = create_weekly_view(events_by_date, date, today)
+    else:  # monthly
+        calendar_content = create_monthly_view(events_by_date, date.year, date.month, today)
+
+    # Create HTML content
+    html = _PAGE_TEMPLATE.substitute(
+        css=_CSS,
+        current_date_str=current_date_str,
+        calendar_content=calendar_content
+    )
 
     # Write the HTML file
     output_file = 'calendar_view.html'
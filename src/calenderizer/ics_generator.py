@@ -15,12 +15,24 @@ The resulting .ics file can be imported into iCal or any other calendar app.
 
 import argparse
 import datetime
-import json
+import functools
+import itertools
 import logging
 import os
 import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from zoneinfo import ZoneInfo
 from icalendar import Calendar, Event
-import pytz
+
+# Optional, noticeably faster schedule parsing: prefer orjson, then ujson
+try:
+    import orjson as _json
+except ImportError:
+    try:
+        import ujson as _json
+    except ImportError:
+        import json as _json
 
 # Default configuration values
 DEFAULT_INPUT_FILE = "schedule.json"
@@ -29,8 +41,95 @@ DEFAULT_TIMEZONE = "America/New_York"
 DEFAULT_TASK_BUFFER_HOURS = 0.5  # 30 minutes
 DEFAULT_WORK_HOURS = 8
 
-def parse_args():
-    """Parse command line arguments."""
+# Large output buffer so the many small per-entry writes are coalesced
+OUTPUT_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+# Below this many entries, starting worker processes costs more than it saves
+PARALLEL_MIN_ENTRIES = 32
+
+# Entries handed to the worker pool at a time, so a streamed schedule is never
+# read into memory all at once
+PARALLEL_BATCH_SIZE = 1024
+
+CALENDAR_PRODID = '-//Geocodio Python Library Project Calendar//'
+
+# Task emojis indexed by (is_first << 1 | is_last): middle, last, first, only
+_TASK_EMOJIS = ("⚡", "🏁", "🎯", "🎯")
+
+@functools.lru_cache(maxsize=8)
+def _get_timezone(timezone_str):
+    """Return the tzinfo for a timezone name, resolving each name only once."""
+    return ZoneInfo(timezone_str)
+
+@functools.lru_cache(maxsize=4096)
+def _parse_dt(date_str, time_str, tzinfo=None):
+    """
+    Parse "YYYY-MM-DD" and "HH:MM" strings into a datetime in the given zone.
+
+    The schedule format is fixed, so splitting the fields and converting them
+    to integers is much cheaper than going through strptime. Results are
+    cached because the same date and start time often recur across entries.
+    """
+    year, month, day = date_str.split('-')
+    hour, minute = time_str.split(':')
+    return datetime.datetime(int(year), int(month), int(day), int(hour), int(minute), tzinfo=tzinfo)
+
+def _task_offsets(hours, buffer_hours):
+    """
+    Compute (start, end) offsets from the first task's start for each task.
+
+    Each task starts once the previous task and the buffer after it are over.
+    The offsets are worked out in a single pass over the task hours so the
+    per-task loop only has to add them to the entry's base datetime.
+    """
+    buffer_delta = datetime.timedelta(hours=buffer_hours)
+    offsets = []
+    start = datetime.timedelta()
+    for task_hours in hours:
+        end = start + datetime.timedelta(hours=task_hours)
+        offsets.append((start, end))
+        start = end + buffer_delta
+    return offsets
+
+def _fold_line(line):
+    """
+    Encode a content line as UTF-8, folded so no physical line exceeds 75 octets.
+
+    Continuation lines start with a single space (RFC 5545, 3.1). Folds are
+    placed on the encoded bytes and backed off to the nearest character
+    boundary, so a UTF-8 sequence is never split across lines.
+    """
+    data = line.encode('utf-8')
+    if len(data) < 75:
+        return data
+
+    pieces = []
+    start = 0
+    while len(data) - start > 74:
+        end = start + 74
+        while data[end] & 0xC0 == 0x80:  # UTF-8 continuation byte
+            end -= 1
+        pieces.append(data[start:end])
+        start = end
+    pieces.append(data[start:])
+    return b'\r\n '.join(pieces)
+
+def _escape_text(value):
+    """Escape a TEXT property value (backslashes, ';', ',' and newlines)."""
+    # Chained str.replace calls are single C scans, and they stay fast for
+    # non-ASCII text (phase emojis), where str.translate falls back to a slow path
+    return (value.replace('\\', '\\\\')
+                 .replace(';', '\\;')
+                 .replace(',', '\\,')
+                 .replace('\r\n', '\\n')
+                 .replace('\n', '\\n'))
+
+def _format_ics_datetime(dt):
+    """Format a datetime as an iCalendar DATE-TIME value (without zone marker)."""
+    return f"{dt.year:04}{dt.month:02}{dt.day:02}T{dt.hour:02}{dt.minute:02}{dt.second:02}"
+
+def _build_parser():
+    """Build the command line argument parser."""
     parser = argparse.ArgumentParser(
         description='Convert JSON schedule to an iCalendar file.'
     )
@@ -58,11 +157,30 @@ def parse_args():
         '--buffer-hours', type=float, default=DEFAULT_TASK_BUFFER_HOURS,
         help='Buffer time between tasks in hours.'
     )
+    parser.add_argument(
+        '--jobs', type=int, default=1,
+        help=f'Worker processes for formatting events (used for {PARALLEL_MIN_ENTRIES}+ entries).'
+    )
+    parser.add_argument(
+        '--force', action='store_true',
+        help='Regenerate the ICS file even if it is newer than the input file.'
+    )
+    parser.add_argument(
+        '--reveal', action=argparse.BooleanOptionalAction, default=True,
+        help='Reveal the ICS file in Finder when done.'
+    )
     parser.add_argument(
         '--verbose', action='store_true',
         help='Enable verbose logging.'
     )
-    return parser.parse_args()
+    return parser
+
+# The CLI is fixed, so the parser is built once and reused by parse_args()
+_PARSER = _build_parser()
+
+def parse_args(argv=None):
+    """Parse command line arguments (sys.argv[1:] unless argv is given)."""
+    return _PARSER.parse_args(argv)
 
 def setup_logging(verbose):
     """Configure logging based on verbosity level."""
@@ -97,15 +215,16 @@ def load_schedule(filename):
       ]
     """
     if not os.path.exists(filename):
-        logging.error(f"Error: {filename} not found. Please create the file with your schedule data.")
+        logging.error("Error: %s not found. Please create the file with your schedule data.", filename)
         return []
     try:
-        with open(filename, "r") as f:
-            schedule = json.load(f)
-        logging.debug(f"Successfully loaded schedule from {filename}")
+        # All of the parsers accept UTF-8 bytes, so skip the text-mode decode
+        with open(filename, "rb") as f:
+            schedule = _json.loads(f.read())
+        logging.debug("Successfully loaded schedule from %s", filename)
         return schedule
-    except json.JSONDecodeError as e:
-        logging.error(f"Error parsing JSON file {filename}: {e}")
+    except ValueError as e:  # Every supported parser raises a ValueError subclass
+        logging.error("Error parsing JSON file %s: %s", filename, e)
         return []
 
 def format_task(task, task_number, total_tasks):
@@ -114,107 +233,251 @@ def format_task(task, task_number, total_tasks):
     Uses emojis and formatting to make it more visually engaging.
     """
     # Use different emojis for different task positions
-    if task_number == 1:
-        emoji = "🎯"  # First task
-    elif task_number == total_tasks:
-        emoji = "🏁"  # Last task
-    else:
-        emoji = "⚡"  # Middle tasks
-
+    emoji = _TASK_EMOJIS[(task_number == 1) << 1 | (task_number == total_tasks)]
     return f"{emoji} {task['hours']} hrs: {task['title']}"
 
-def create_events(entry, timezone_str, default_start_time=None, buffer_hours=DEFAULT_TASK_BUFFER_HOURS):
+def _iter_tasks(entry, tz, default_start_time=None, buffer_hours=DEFAULT_TASK_BUFFER_HOURS):
     """
-    Create iCalendar events for each task in a schedule entry.
+    Yield (summary, description, start, end) for each task in a schedule entry.
 
-    - Creates a separate event for each task
-    - Calculates start time based on previous tasks and buffer time
-    - Sets the summary to include the phase and task title
-    - The description includes the task hours and position
+    Start times are calculated from the entry's start time, the previous
+    tasks and the buffer time between tasks.
     """
-    tz = pytz.timezone(timezone_str)
-
     # Use provided start_time or default_start_time
     start_time_str = entry.get('start_time') or default_start_time
     if not start_time_str:
-        logging.warning(f"No start time provided for {entry['date']}, using default")
+        logging.warning("No start time provided for %s, using default", entry['date'])
         start_time_str = "09:00"  # Fallback default
 
-    base_start_dt = datetime.datetime.strptime(f"{entry['date']} {start_time_str}", "%Y-%m-%d %H:%M")
-    base_start_dt = tz.localize(base_start_dt)
+    base_start_dt = _parse_dt(entry['date'], start_time_str, tz)
 
-    events = []
-    current_start = base_start_dt
+    tasks = entry['tasks']
+    total_tasks = len(tasks)
+    phase = entry['phase']
+    offsets = _task_offsets([task['hours'] for task in tasks], buffer_hours)
 
-    for i, task in enumerate(entry['tasks'], 1):
+    for i, (task, (start_offset, end_offset)) in enumerate(zip(tasks, offsets), 1):
         # Create summary with phase and task
-        summary = f"{entry['phase']}: {task['title']}"
+        summary = f"{phase}: {task['title']}"
 
         # Create description with task details
-        description = format_task(task, i, len(entry['tasks']))
+        description = format_task(task, i, total_tasks)
+
+        yield summary, description, base_start_dt + start_offset, base_start_dt + end_offset
+
+def create_events(entry, timezone_str, default_start_time=None, buffer_hours=DEFAULT_TASK_BUFFER_HOURS,
+                  dtstamp=None):
+    """
+    Create iCalendar events for each task in a schedule entry.
 
-        # Calculate end time for this task
-        end_dt = current_start + datetime.timedelta(hours=task['hours'])
+    - Creates a separate event for each task
+    - Calculates start time based on previous tasks and buffer time
+    - Sets the summary to include the phase and task title
+    - The description includes the task hours and position
+    - All events share one DTSTAMP (the current time unless dtstamp is given),
+      in UTC as RFC 5545 requires
+    """
+    tz = _get_timezone(timezone_str)
+    if dtstamp is None:
+        dtstamp = datetime.datetime.now(datetime.timezone.utc)
+    else:
+        dtstamp = dtstamp.astimezone(datetime.timezone.utc)
 
+    events = []
+    for summary, description, start, end in _iter_tasks(entry, tz, default_start_time, buffer_hours):
         event = Event()
         event.add('summary', summary)
         event.add('description', description)
-        event.add('dtstart', current_start)
-        event.add('dtend', end_dt)
-        event.add('dtstamp', datetime.datetime.now(tz))
+        event.add('dtstart', start)
+        event.add('dtend', end)
+        event.add('dtstamp', dtstamp)
         events.append(event)
 
-        # Update start time for next task (including buffer)
-        current_start = end_dt + datetime.timedelta(hours=buffer_hours)
-
     return events
 
-def create_calendar(schedule, timezone_str, default_start_time=None, buffer_hours=DEFAULT_TASK_BUFFER_HOURS):
+def create_calendar(schedule, timezone_str, default_start_time=None, buffer_hours=DEFAULT_TASK_BUFFER_HOURS,
+                    dtstamp=None):
     """
     Create an iCalendar (Calendar) object by iterating over the schedule entries
     and creating individual events for each task.
+
+    Every event gets the same DTSTAMP: dtstamp if given, otherwise the moment
+    the calendar was created.
     """
+    if dtstamp is None:
+        dtstamp = datetime.datetime.now(datetime.timezone.utc)
+
     cal = Calendar()
-    cal.add('prodid', '-//Geocodio Python Library Project Calendar//')
+    cal.add('prodid', CALENDAR_PRODID)
     cal.add('version', '2.0')
 
     for entry in schedule:
-        events = create_events(entry, timezone_str, default_start_time, buffer_hours)
+        events = create_events(entry, timezone_str, default_start_time, buffer_hours, dtstamp)
         for event in events:
             cal.add_component(event)
 
     return cal
 
+def _vevent_bytes(entry, tz, default_start_time, buffer_hours, dtstamp_line):
+    """
+    Serialize the events for one schedule entry directly as VEVENT bytes.
+
+    The schema is fixed, so the content lines are formatted by hand rather
+    than going through icalendar's Event objects and property classes.
+    """
+    if tz.key == 'UTC':
+        dt_params, dt_suffix = '', 'Z'
+    else:
+        dt_params, dt_suffix = f';TZID={tz.key}', ''
+
+    lines = []
+    for summary, description, start, end in _iter_tasks(entry, tz, default_start_time, buffer_hours):
+        lines += (
+            b'BEGIN:VEVENT',
+            _fold_line('SUMMARY:' + _escape_text(summary)),
+            _fold_line(f'DTSTART{dt_params}:{_format_ics_datetime(start)}{dt_suffix}'),
+            _fold_line(f'DTEND{dt_params}:{_format_ics_datetime(end)}{dt_suffix}'),
+            dtstamp_line,
+            _fold_line('DESCRIPTION:' + _escape_text(description)),
+            b'END:VEVENT',
+        )
+    lines.append(b'')
+    return b'\r\n'.join(lines)
+
+def write_ics(schedule, f, timezone_str, default_start_time=None, buffer_hours=DEFAULT_TASK_BUFFER_HOURS,
+              dtstamp=None, jobs=1):
+    """
+    Write the schedule to a binary file object as an iCalendar file.
+
+    The content matches create_calendar(...).to_ical(), but each entry's
+    events are formatted straight to bytes and written as they are produced,
+    so neither icalendar objects nor the whole file are held in memory.
+
+    The schedule is consumed one entry at a time, so any iterable of entries
+    works, including a generator that reads them from a streaming source.
+
+    Every event shares one DTSTAMP (dtstamp if given, otherwise the current
+    time). It is formatted in UTC once and reused as-is for each event.
+
+    Entries are independent, so with jobs > 1 and a large enough schedule they
+    are formatted in a pool of worker processes, PARALLEL_BATCH_SIZE entries
+    at a time; output order is unchanged.
+    """
+    tz = _get_timezone(timezone_str)
+    if dtstamp is None:
+        dtstamp = datetime.datetime.now(datetime.timezone.utc)
+    utc_dtstamp = dtstamp.astimezone(datetime.timezone.utc)
+    dtstamp_line = f'DTSTAMP:{_format_ics_datetime(utc_dtstamp)}Z'.encode('ascii')
+
+    render = functools.partial(
+        _vevent_bytes,
+        tz=tz,
+        default_start_time=default_start_time,
+        buffer_hours=buffer_hours,
+        dtstamp_line=dtstamp_line
+    )
+
+    f.write(f'BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{CALENDAR_PRODID}\r\n'.encode('utf-8'))
+    entries = iter(schedule)
+    if jobs > 1:
+        # Only look far enough ahead to know whether the pool is worth it
+        head = list(itertools.islice(entries, PARALLEL_MIN_ENTRIES))
+        entries = itertools.chain(head, entries)
+    if jobs > 1 and len(head) >= PARALLEL_MIN_ENTRIES:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            while batch := list(itertools.islice(entries, PARALLEL_BATCH_SIZE)):
+                for chunk in executor.map(render, batch, chunksize=16):
+                    f.write(chunk)
+    else:
+        for entry in entries:
+            f.write(render(entry))
+    f.write(b'END:VCALENDAR\r\n')
+
+def is_up_to_date(input_file, output_file):
+    """Return True if output_file exists and is at least as new as input_file."""
+    try:
+        return os.path.getmtime(output_file) >= os.path.getmtime(input_file)
+    except OSError:
+        return False
+
+def _output_mode(path):
+    """Permissions for a regenerated path: its current mode, or the umask default."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def reveal_file(path):
+    """
+    Reveal a file in Finder instead of opening it.
+
+    `open` is started without waiting for it, so the caller can exit while
+    Finder catches up.
+    """
+    try:
+        subprocess.Popen(
+            ['open', '-R', path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
+    except OSError as e:
+        logging.warning("Could not reveal %s: %s", path, e)
+
 def main():
+    # One creation timestamp for the whole run (RFC 5545 DTSTAMP)
+    dtstamp = datetime.datetime.now(datetime.timezone.utc)
     args = parse_args()
     setup_logging(args.verbose)
 
-    logging.info(f"Starting calendar generation with configuration:")
-    logging.info(f"  Input file: {args.input}")
-    logging.info(f"  Output file: {args.output}")
-    logging.info(f"  Timezone: {args.timezone}")
-    logging.info(f"  Default start time: {args.start_time or 'Not set'}")
-    logging.info(f"  Work hours per day: {args.work_hours}")
-    logging.info(f"  Buffer between tasks: {args.buffer_hours} hours")
-
-    schedule = load_schedule(args.input)
-    if not schedule:
-        return
-
-    cal = create_calendar(
-        schedule,
-        args.timezone,
-        args.start_time,
-        args.buffer_hours
-    )
+    logging.info("Starting calendar generation with configuration:")
+    logging.info("  Input file: %s", args.input)
+    logging.info("  Output file: %s", args.output)
+    logging.info("  Timezone: %s", args.timezone)
+    logging.info("  Default start time: %s", args.start_time or 'Not set')
+    logging.info("  Work hours per day: %s", args.work_hours)
+    logging.info("  Buffer between tasks: %s hours", args.buffer_hours)
+    logging.info("  Worker processes: %s", args.jobs)
 
     output_path = os.path.abspath(args.output)
-    with open(args.output, 'wb') as f:
-        f.write(cal.to_ical())
-    logging.info(f"Calendar exported to {output_path}")
+    if not args.force and is_up_to_date(args.input, args.output):
+        # Nothing changed since the last run, so skip parsing and writing
+        logging.info("%s is up to date (use --force to regenerate)", output_path)
+    else:
+        schedule = load_schedule(args.input)
+        if not schedule:
+            return
+
+        # Fail on an unknown timezone before touching any files
+        _get_timezone(args.timezone)
+
+        # Write next to the real output (through any symlink) and swap the
+        # file in only once it is complete, so a failed run never leaves a
+        # truncated (but newer) file
+        target_path = os.path.realpath(args.output)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(target_path), suffix='.tmp')
+        try:
+            with open(fd, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
+                os.fchmod(f.fileno(), _output_mode(target_path))
+                write_ics(
+                    schedule,
+                    f,
+                    args.timezone,
+                    args.start_time,
+                    args.buffer_hours,
+                    dtstamp=dtstamp,
+                    jobs=args.jobs
+                )
+            os.replace(temp_path, target_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        logging.info("Calendar exported to %s", output_path)
 
-    # Reveal the file in Finder instead of opening it
-    subprocess.run(['open', '-R', args.output])
+    if args.reveal:
+        reveal_file(args.output)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,14 +1,20 @@
+import io
 import json
 import os
 import sys
 import tempfile
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from icalendar import Calendar
+from src.calenderizer import ics_generator
 from src.calenderizer.ics_generator import (
     load_schedule,
     create_events,
+    format_task,
     create_calendar,
+    write_ics,
+    is_up_to_date,
+    main,
     parse_args,
     DEFAULT_INPUT_FILE,
     DEFAULT_OUTPUT_FILE,
@@ -50,6 +56,13 @@ def test_load_schedule(temp_schedule_file):
     assert len(schedule[0]['tasks']) == 2
     os.unlink(temp_schedule_file)
 
+def test_load_schedule_utf8(sample_schedule):
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', encoding='utf-8', delete=False) as f:
+        json.dump(sample_schedule, f, ensure_ascii=False)
+    schedule = load_schedule(f.name)
+    assert schedule[0]['phase'] == "🔵 Res/API"
+    os.unlink(f.name)
+
 def test_load_schedule_nonexistent():
     schedule = load_schedule("nonexistent.json")
     assert schedule == []
@@ -83,6 +96,11 @@ def test_create_events(sample_schedule):
     assert event2['description'].startswith("🏁 2 hrs:")
     assert (event2['dtend'].dt - event2['dtstart'].dt).total_seconds() == 2 * 3600
 
+def test_format_task_emojis():
+    task = {"hours": 1, "title": "Task"}
+    assert [format_task(task, i, 3)[0] for i in (1, 2, 3)] == ["🎯", "⚡", "🏁"]
+    assert format_task(task, 1, 1) == "🎯 1 hrs: Task"
+
 def test_create_events_with_default_start_time(sample_schedule):
     # Remove start_time from schedule
     schedule_without_start = sample_schedule[0].copy()
@@ -97,6 +115,20 @@ def test_create_events_with_default_start_time(sample_schedule):
     assert len(events) == 2
     assert events[0]['dtstart'].dt.hour == 10
 
+def test_create_events_start_times(sample_schedule):
+    events = create_events(
+        sample_schedule[0],
+        timezone_str="UTC",
+        buffer_hours=0.5
+    )
+    assert events[0]['dtstart'].dt.replace(tzinfo=None) == datetime(2024, 4, 1, 9, 0)
+    assert events[1]['dtstart'].dt.replace(tzinfo=None) == datetime(2024, 4, 1, 13, 30)
+
+def test_create_events_invalid_date(sample_schedule):
+    entry = dict(sample_schedule[0], date="2024-13-01")
+    with pytest.raises(ValueError):
+        create_events(entry, timezone_str="UTC")
+
 def test_create_calendar(sample_schedule):
     cal = create_calendar(
         sample_schedule,
@@ -107,6 +139,193 @@ def test_create_calendar(sample_schedule):
     assert isinstance(cal, Calendar)
     assert len(cal.walk('VEVENT')) == 2
 
+def test_create_calendar_shares_dtstamp(sample_schedule):
+    cal = create_calendar(
+        sample_schedule * 2,
+        timezone_str="UTC",
+        default_start_time="09:00",
+        buffer_hours=0.5
+    )
+    dtstamps = {event['dtstamp'].dt for event in cal.walk('VEVENT')}
+    assert len(dtstamps) == 1
+
+def test_write_ics_matches_create_calendar_default_dtstamp(sample_schedule):
+    timezone_str = "America/New_York"
+    cal = create_calendar(sample_schedule, timezone_str=timezone_str, default_start_time="09:00")
+    dtstamp = cal.walk('VEVENT')[0]['dtstamp'].dt
+    assert dtstamp.utcoffset() == timedelta(0)
+    buf = io.BytesIO()
+    write_ics(sample_schedule, buf, timezone_str=timezone_str, default_start_time="09:00", dtstamp=dtstamp)
+    assert buf.getvalue() == cal.to_ical()
+
+@pytest.mark.parametrize("timezone_str", ["UTC", "America/New_York"])
+def test_write_ics_matches_create_calendar(sample_schedule, timezone_str):
+    schedule = sample_schedule + [
+        {
+            "date": "2024-04-02",
+            "phase": "🟢 Design, review; plan",
+            "start_time": "9:15",
+            "tasks": [
+                {"hours": 1.5, "title": "A very long task title that needs folding " * 4},
+                {"hours": 0.25, "title": "Café\\notes\nsecond line " + "é" * 80},
+                {"hours": 3, "title": "Wrap up"}
+            ]
+        }
+    ]
+    dtstamp = datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc)
+    cal = create_calendar(
+        schedule,
+        timezone_str=timezone_str,
+        default_start_time="09:00",
+        buffer_hours=0.5,
+        dtstamp=dtstamp
+    )
+    buf = io.BytesIO()
+    write_ics(
+        schedule,
+        buf,
+        timezone_str=timezone_str,
+        default_start_time="09:00",
+        buffer_hours=0.5,
+        dtstamp=dtstamp
+    )
+    assert b"DTSTAMP:20240301T123000Z\r\n" in buf.getvalue()
+    assert buf.getvalue() == cal.to_ical()
+
+def test_write_ics_accepts_iterator(sample_schedule):
+    buf = io.BytesIO()
+    write_ics(iter(sample_schedule * 2), buf, timezone_str="UTC")
+    cal = Calendar.from_ical(buf.getvalue())
+    assert len(cal.walk('VEVENT')) == 4
+
+def test_write_ics_parallel_matches_serial(sample_schedule):
+    schedule = [dict(sample_schedule[0], date=f"2024-04-{day:02d}") for day in range(1, 31)] * 2
+    dtstamp = datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc)
+    serial, parallel = io.BytesIO(), io.BytesIO()
+    write_ics(schedule, serial, timezone_str="UTC", dtstamp=dtstamp)
+    write_ics(iter(schedule), parallel, timezone_str="UTC", dtstamp=dtstamp, jobs=2)
+    assert parallel.getvalue() == serial.getvalue()
+
+def test_write_ics_parallel_streams_schedule(monkeypatch, sample_schedule):
+    monkeypatch.setattr(ics_generator, 'PARALLEL_BATCH_SIZE', 40)
+    pulled = 0
+    max_ahead = 0
+    buf = io.BytesIO()
+
+    def entries():
+        nonlocal pulled, max_ahead
+        for day in range(1, 101):
+            pulled += 1
+            max_ahead = max(max_ahead, pulled - buf.getvalue().count(b'BEGIN:VEVENT') // 2)
+            yield dict(sample_schedule[0], date=f"2024-04-{day % 30 + 1:02d}")
+
+    write_ics(entries(), buf, timezone_str="UTC", jobs=2)
+    assert len(Calendar.from_ical(buf.getvalue()).walk('VEVENT')) == 200
+    # Never more than the look-ahead plus one batch is read ahead of the output
+    assert max_ahead <= ics_generator.PARALLEL_MIN_ENTRIES + 40
+
+def test_is_up_to_date(temp_schedule_file):
+    with tempfile.NamedTemporaryFile(suffix='.ics', delete=False) as f:
+        output_file = f.name
+    try:
+        mtime = os.path.getmtime(temp_schedule_file)
+        os.utime(output_file, (mtime + 10, mtime + 10))
+        assert is_up_to_date(temp_schedule_file, output_file)
+
+        os.utime(output_file, (mtime - 10, mtime - 10))
+        assert not is_up_to_date(temp_schedule_file, output_file)
+
+        os.unlink(output_file)
+        assert not is_up_to_date(temp_schedule_file, output_file)
+    finally:
+        os.unlink(temp_schedule_file)
+
+def run_main(monkeypatch, input_file, output_file, *extra_args):
+    monkeypatch.setattr(sys, 'argv', [
+        'ics_generator.py', '-i', str(input_file), '-o', str(output_file), '--no-reveal', *extra_args
+    ])
+    main()
+
+@pytest.mark.parametrize("bad_args, bad_entry", [
+    (['-t', 'America/New_Yrok'], {}),
+    ([], {"date": "2024-13-01"}),
+    (['--start-time', 'nine'], {"start_time": None}),
+])
+def test_main_failed_run_keeps_previous_output(monkeypatch, tmp_path, sample_schedule, bad_args, bad_entry):
+    input_file = tmp_path / "schedule.json"
+    input_file.write_text(json.dumps(sample_schedule + [dict(sample_schedule[0], **bad_entry)]))
+    output_file = tmp_path / "out.ics"
+    output_file.write_bytes(b"previous calendar")
+    mtime = os.path.getmtime(input_file) - 10
+    os.utime(output_file, (mtime, mtime))
+
+    with pytest.raises(Exception):
+        run_main(monkeypatch, input_file, output_file, *bad_args)
+
+    assert output_file.read_bytes() == b"previous calendar"
+    assert os.path.getmtime(output_file) == mtime
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.ics", "schedule.json"]
+
+def test_main_writes_through_symlinked_output(monkeypatch, tmp_path, sample_schedule):
+    input_file = tmp_path / "schedule.json"
+    input_file.write_text(json.dumps(sample_schedule))
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    real_file = real_dir / "cal.ics"
+    real_file.write_bytes(b"")
+    real_file.chmod(0o644)
+    os.utime(real_file, (946684800, 946684800))
+    link = tmp_path / "link.ics"
+    link.symlink_to(real_file)
+
+    run_main(monkeypatch, input_file, link)
+
+    assert link.is_symlink()
+    assert len(Calendar.from_ical(real_file.read_bytes()).walk('VEVENT')) == 2
+    assert real_file.stat().st_mode & 0o777 == 0o644
+    assert sorted(p.name for p in real_dir.iterdir()) == ["cal.ics"]
+
+def test_main_ignores_leftover_temp_files(monkeypatch, tmp_path, sample_schedule):
+    input_file = tmp_path / "schedule.json"
+    input_file.write_text(json.dumps(sample_schedule))
+    output_file = tmp_path / "out.ics"
+    # A temp file left behind by a killed run with the same PID
+    leftover = tmp_path / f"out.ics.{os.getpid()}.tmp"
+    leftover.write_bytes(b"partial")
+
+    run_main(monkeypatch, input_file, output_file)
+
+    assert len(Calendar.from_ical(output_file.read_bytes()).walk('VEVENT')) == 2
+    assert leftover.read_bytes() == b"partial"
+
+def test_main_skips_up_to_date_output(monkeypatch, tmp_path, sample_schedule):
+    input_file = tmp_path / "schedule.json"
+    input_file.write_text(json.dumps(sample_schedule))
+    output_file = tmp_path / "out.ics"
+    output_file.write_bytes(b"previous calendar")
+    mtime = os.path.getmtime(input_file) + 10
+    os.utime(output_file, (mtime, mtime))
+
+    run_main(monkeypatch, input_file, output_file)
+    assert output_file.read_bytes() == b"previous calendar"
+
+    run_main(monkeypatch, input_file, output_file, '--force')
+    assert len(Calendar.from_ical(output_file.read_bytes()).walk('VEVENT')) == 2
+
+def test_main_regenerates_after_failed_run(monkeypatch, tmp_path, sample_schedule):
+    input_file = tmp_path / "schedule.json"
+    input_file.write_text(json.dumps(sample_schedule))
+    output_file = tmp_path / "out.ics"
+
+    with pytest.raises(Exception):
+        run_main(monkeypatch, input_file, output_file, '-t', 'America/New_Yrok')
+    assert not output_file.exists()
+
+    # Retrying with the fixed option must not be skipped as "up to date"
+    run_main(monkeypatch, input_file, output_file, '-t', 'America/New_York')
+    cal = Calendar.from_ical(output_file.read_bytes())
+    assert len(cal.walk('VEVENT')) == 2
+
 def test_parse_args_defaults():
     # Save original argv
     orig_argv = sys.argv
@@ -119,11 +338,20 @@ def test_parse_args_defaults():
         assert args.timezone == DEFAULT_TIMEZONE
         assert args.work_hours == DEFAULT_WORK_HOURS
         assert args.buffer_hours == DEFAULT_TASK_BUFFER_HOURS
+        assert args.jobs == 1
+        assert not args.force
+        assert args.reveal
         assert not args.verbose
     finally:
         # Restore original argv
         sys.argv = orig_argv
 
+def test_parse_args_argv():
+    args = parse_args(['-i', 'custom.json', '--jobs', '4'])
+    assert args.input == 'custom.json'
+    assert args.jobs == 4
+    assert args.output == DEFAULT_OUTPUT_FILE
+
 def test_parse_args_custom():
     # Save original argv
     orig_argv = sys.argv
@@ -136,6 +364,7 @@ def test_parse_args_custom():
         '--start-time', '10:00',
         '--work-hours', '6',
         '--buffer-hours', '0.25',
+        '--no-reveal',
         '--verbose'
     ]
     try:
@@ -146,6 +375,7 @@ def test_parse_args_custom():
         assert args.start_time == '10:00'
         assert args.work_hours == 6
         assert args.buffer_hours == 0.25
+        assert not args.reveal
         assert args.verbose
     finally:
         # Restore original argv
@@ -0,0 +1,127 @@
+import calendar
+import os
+import re
+import tempfile
+import pytest
+from datetime import datetime
+from icalendar import Alarm, Calendar
+from src.calenderizer.ics_generator import create_calendar
+from src.calenderizer.calendar_viewer import create_html_calendar, create_monthly_view, load_events
+
+@pytest.fixture
+def sample_schedule():
+    return [
+        {
+            "date": "2024-04-01",
+            "phase": "🔵 Res/API",
+            "start_time": "09:00",
+            "tasks": [
+                {
+                    "hours": 4,
+                    "title": "Implement API endpoints, docs; and a very long title " * 3
+                },
+                {
+                    "hours": 2,
+                    "title": "Write documentation\nwith a back\\slash"
+                }
+            ]
+        }
+    ]
+
+def _dump_ics_tmp(cal):
+    with tempfile.NamedTemporaryFile(suffix='.ics', delete=False) as f:
+        f.write(cal.to_ical())
+        return f.name
+
+@pytest.mark.parametrize("timezone_str", ["UTC", "America/New_York"])
+def test_load_events_matches_icalendar(sample_schedule, timezone_str):
+    cal = create_calendar(sample_schedule, timezone_str=timezone_str)
+    ics_file = _dump_ics_tmp(cal)
+    try:
+        events = list(load_events(ics_file))
+    finally:
+        os.unlink(ics_file)
+
+    expected = Calendar.from_ical(cal.to_ical()).walk('VEVENT')
+    assert len(events) == len(expected)
+    for event, component in zip(events, expected):
+        assert event['start'] == component['dtstart'].dt
+        assert event['end'] == component['dtend'].dt
+        assert event['start'].utcoffset() == component['dtstart'].dt.utcoffset()
+        assert event['summary'] == component['summary']
+        assert event['description'] == component['description']
+
+def test_load_events_ignores_nested_components(sample_schedule):
+    cal = create_calendar(sample_schedule, timezone_str="UTC")
+    alarm = Alarm()
+    alarm.add('action', 'DISPLAY')
+    alarm.add('description', 'Reminder')
+    cal.subcomponents[0].add_component(alarm)
+    ics_file = _dump_ics_tmp(cal)
+    try:
+        events = list(load_events(ics_file))
+    finally:
+        os.unlink(ics_file)
+
+    assert events[0]['description'].startswith("🎯 4 hrs:")
+    assert events[0]['start'].replace(tzinfo=None) == datetime(2024, 4, 1, 9, 0)
+
+@pytest.mark.parametrize("view", ["daily", "weekly", "monthly"])
+def test_create_html_calendar_escapes_event_text(monkeypatch, tmp_path, view):
+    schedule = [
+        {
+            "date": "2024-04-01",
+            "phase": "<b>Phase</b>",
+            "start_time": "09:00",
+            "tasks": [{"hours": 2, "title": 'Fix "quotes" & <script>'}]
+        }
+    ]
+    ics_file = tmp_path / "schedule.ics"
+    ics_file.write_bytes(create_calendar(schedule, timezone_str="UTC").to_ical())
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("webbrowser.open", lambda url: None)
+
+    create_html_calendar(str(ics_file), view=view, date="2024-04-01")
+    page = (tmp_path / "calendar_view.html").read_text(encoding="utf-8")
+
+    assert "<b>Phase</b>" not in page
+    assert "<script>" not in page
+    assert 'Fix "quotes"' not in page
+    assert "Fix &quot;quotes&quot; &amp; &lt;script&gt;" in page
+    if view == "daily":
+        assert "&lt;b&gt;Phase&lt;/b&gt;" in page
+        assert '<div class="event-description">🎯 2 hrs: Fix &quot;quotes&quot; &amp; &lt;script&gt;</div>' in page
+    else:
+        # The description is also rendered inside a title="..." attribute
+        assert 'title="🎯 2 hrs: Fix &quot;quotes&quot; &amp; &lt;script&gt;"' in page
+
+def month_cells(html):
+    """Day numbers of the grid cells in order, with 0 for padding cells."""
+    cells = re.findall(r'<div class="day(?: other-month)?(?: today)?">(?:<div class="day-number">(\d+)</div>)?', html)
+    return [int(day) if day else 0 for day in cells]
+
+@pytest.mark.parametrize("year, month", [(2024, 2), (2024, 9), (2025, 6), (2026, 3)])
+def test_monthly_view_matches_monthcalendar(year, month):
+    try:
+        # Re-render the same month after changing the first day of the week
+        for firstweekday in (calendar.MONDAY, calendar.SUNDAY, calendar.THURSDAY):
+            calendar.setfirstweekday(firstweekday)
+            html = create_monthly_view({}, year, month)
+            expected = [day for week in calendar.monthcalendar(year, month) for day in week]
+            assert month_cells(html) == expected
+    finally:
+        calendar.setfirstweekday(calendar.MONDAY)
+
+def test_monthly_view_fills_only_days_in_month():
+    event = {'description_html': 'Desc', 'time_str': '09:00', 'title': 'Kickoff'}
+    events_by_date = {
+        datetime(2024, 4, 10).date(): [event],
+        datetime(2024, 5, 10).date(): [dict(event, title='Next month')],
+    }
+    html = create_monthly_view(events_by_date, 2024, 4, today=datetime(2024, 4, 2).date())
+    assert html.count('class="event"') == 1
+    assert 'Next month' not in html
+    assert '<div class="day today"><div class="day-number">2</div>' in html
+
+    html = create_monthly_view(events_by_date, 2024, 4, today=datetime(2024, 5, 2).date())
+    assert 'class="day today"' not in html